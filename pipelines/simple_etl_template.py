@@ -4,19 +4,37 @@ This is a starter template for building ETL pipelines.
 Modify this template for your specific use cases.
 """
 
+import sys
+import atexit
+import queue
+import numpy as np
 import pandas as pd
 import logging
+import logging.handlers
 from datetime import datetime
 from pathlib import Path
 
+# Make the project root importable when running from the pipelines/ directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from utils.data_quality import optimize_dtypes
+
 # Configure logging
+# File/console writes happen on a background thread; logging calls only enqueue records
+formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+file_handler = logging.FileHandler('../logs/etl_pipeline.log')
+file_handler.setFormatter(formatter)
+stream_handler = logging.StreamHandler()
+stream_handler.setFormatter(formatter)
+
+log_queue = queue.Queue(-1)
+log_listener = logging.handlers.QueueListener(log_queue, file_handler, stream_handler)
+log_listener.start()
+atexit.register(log_listener.stop)  # Flush queued records on exit
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('../logs/etl_pipeline.log'),
-        logging.StreamHandler()
-    ]
+    format='%(message)s',  # Formatting is done by the listener's handlers
+    handlers=[logging.handlers.QueueHandler(log_queue)]
 )
 logger = logging.getLogger(__name__)
 
@@ -26,16 +44,18 @@ class SimpleETLPipeline:
     A simple ETL pipeline template with extract, transform, and load methods.
     """
 
-    def __init__(self, source_path, target_path):
+    def __init__(self, source_path, target_path, chunksize=100_000):
         """
         Initialize the ETL pipeline.
 
         Args:
             source_path (str): Path to source data file
             target_path (str): Path to save processed data
+            chunksize (int): Number of rows processed at a time
         """
         self.source_path = source_path
         self.target_path = target_path
+        self.chunksize = chunksize
         self.data = None
         self.run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
 
@@ -43,15 +63,21 @@ class SimpleETLPipeline:
         """
         Extract data from source.
         Modify this method based on your data source (CSV, JSON, API, Database, etc.)
+
+        Data is read lazily in chunks of `chunksize` rows, so self.data is an
+        iterator of DataFrames rather than a single DataFrame.
         """
         try:
             logger.info(f"Starting extraction from {self.source_path}")
 
-            # Example: Reading CSV file
-            self.data = pd.read_csv(self.source_path)
+            # Example: Reading CSV file in chunks so the data never has to fit in memory at once
+            reader = pd.read_csv(self.source_path, chunksize=self.chunksize)
 
-            logger.info(f"Successfully extracted {len(self.data)} records")
-            logger.info(f"Columns: {list(self.data.columns)}")
+            # Smaller dtypes make every later scan cheaper. Integers keep their
+            # width so derived columns in transform() cannot overflow.
+            self.data = (optimize_dtypes(chunk, downcast_integers=False) for chunk in reader)
+
+            logger.info(f"Reading {self.source_path} in chunks of {self.chunksize} rows")
 
             return self.data
 
@@ -73,35 +99,143 @@ class SimpleETLPipeline:
             if self.data is None:
                 raise ValueError("No data to transform. Run extract() first.")
 
-            initial_count = len(self.data)
+            self.data = self._transform_chunks(self.data)
+
+            return self.data
+
+        except Exception as e:
+            logger.error(f"Error during transformation: {str(e)}")
+            raise
+
+    def _transform_chunks(self, chunks):
+        """
+        Apply the transformations to each chunk as it is read.
+
+        Duplicates are removed across chunks by remembering a 64-bit hash of
+        every distinct row seen so far. That set grows with the number of
+        distinct rows in the file, so memory is bounded by the chunk size
+        plus the set, not by the chunk size alone.
+        """
+        # Row hashes seen so far, so duplicates spanning chunks are removed too
+        seen_hashes = set()
+        # Numeric dtypes of the first chunk, so every chunk is written the same way
+        reference_dtypes = None
+
+        for chunk in chunks:
+            initial_count = len(chunk)
 
             # Example transformations:
 
             # 1. Remove duplicates
-            self.data = self.data.drop_duplicates()
-            logger.info(f"Removed {initial_count - len(self.data)} duplicate records")
+            hashes = self._row_hashes(chunk)
+            hash_list = hashes.tolist()
+            # Probe the set per row; isin() would rebuild a table from the whole set each chunk
+            seen_before = np.fromiter(map(seen_hashes.__contains__, hash_list),
+                                      dtype=bool, count=len(hash_list))
+            is_new = ~hashes.duplicated().to_numpy() & ~seen_before
+            seen_hashes.update(hash_list)
+            chunk = chunk[is_new]
+            logger.info(f"Removed {initial_count - len(chunk)} duplicate records")
 
             # 2. Handle missing values
-            missing_before = self.data.isnull().sum().sum()
-            self.data = self.data.fillna('')  # or dropna(), depending on requirements
+            # One reduction per column gives both the total and the columns to fill
+            null_counts = len(chunk) - chunk.count()
+            missing_before = int(null_counts.sum())
+            columns_with_nulls = null_counts.index[null_counts > 0]
+            # Fill numeric columns with 0 and the rest with '' so numbers keep their dtype
+            numeric_cols = set(chunk.select_dtypes('number').columns)
+            fill_values = {col: 0 if col in numeric_cols else '' for col in columns_with_nulls}
+            # Categorical columns need '' registered as a category before filling with it
+            categorical = {col: chunk[col].cat.add_categories('')
+                           for col in chunk[columns_with_nulls].select_dtypes('category').columns
+                           if '' not in chunk[col].cat.categories}
+            chunk = chunk.assign(**categorical).fillna(fill_values)  # or dropna(), depending on requirements
             logger.info(f"Handled {missing_before} missing values")
 
+            # Give numeric columns the same int/float type in every chunk
+            chunk = self._align_dtypes(chunk, fill_values, reference_dtypes)
+            if reference_dtypes is None:
+                reference_dtypes = chunk.dtypes
+
             # 3. Data type conversions (example)
-            # self.data['date_column'] = pd.to_datetime(self.data['date_column'])
+            # chunk['date_column'] = pd.to_datetime(chunk['date_column'])
 
             # 4. Add derived columns (example)
-            # self.data['full_name'] = self.data['first_name'] + ' ' + self.data['last_name']
+            # chunk['full_name'] = chunk['first_name'] + ' ' + chunk['last_name']
 
             # 5. Filter data (example)
-            # self.data = self.data[self.data['status'] == 'active']
+            # chunk = chunk[chunk['status'] == 'active']
 
-            logger.info(f"Transformation complete. Final record count: {len(self.data)}")
+            yield chunk
 
-            return self.data
+    @staticmethod
+    def _align_dtypes(chunk, filled_columns, reference_dtypes):
+        """
+        Make int/float column types consistent across chunks.
 
-        except Exception as e:
-            logger.error(f"Error during transformation: {str(e)}")
-            raise
+        read_csv infers dtypes per chunk, so a column with a missing value
+        in one chunk is float there and int elsewhere. Filled float columns
+        that hold only whole numbers go back to int64. After that, columns
+        follow the first chunk's type when the conversion is lossless.
+        """
+        def is_whole(series):
+            values = series.to_numpy()
+            return bool(np.all(np.isfinite(values) & (values == np.floor(values))))
+
+        converted = {}
+        for col in chunk.columns:
+            original = series = chunk[col]
+            if pd.api.types.is_float_dtype(series) and col in filled_columns and is_whole(series):
+                series = series.astype('int64')
+
+            if reference_dtypes is not None and col in reference_dtypes.index:
+                reference = reference_dtypes[col]
+                if pd.api.types.is_float_dtype(reference) and pd.api.types.is_integer_dtype(series):
+                    series = series.astype(reference)
+                elif (pd.api.types.is_integer_dtype(reference) and pd.api.types.is_float_dtype(series)
+                      and is_whole(series)):
+                    series = series.astype(reference)
+
+            if series is not original:
+                converted[col] = series
+
+        return chunk.assign(**converted) if converted else chunk
+
+    @staticmethod
+    def _row_hashes(chunk):
+        """
+        Hash each row of a chunk independently of the dtypes inferred for that chunk.
+
+        read_csv and optimize_dtypes can give the same column different dtypes in
+        different chunks (int vs float, float32 vs float64, category vs str), and
+        hash_pandas_object hashes equal values differently across dtypes.
+        Each numeric column is therefore split into an exact Int64 part (whole
+        numbers) and a float64 part (everything else), and other columns are
+        hashed as Python objects.
+        """
+        canonical = {}
+        for i, col in enumerate(chunk.columns):
+            series = chunk[col]
+
+            if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+                if pd.api.types.is_integer_dtype(series):
+                    whole = series.astype('Int64')
+                    fraction = pd.Series(np.nan, index=chunk.index)
+                else:
+                    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+                    with np.errstate(invalid='ignore'):
+                        is_whole = (np.isfinite(values) & (values == np.floor(values))
+                                    & (np.abs(values) < 2.0 ** 63))
+                    whole = pd.Series(pd.array(np.where(is_whole, values, 0).astype(np.int64),
+                                               dtype='Int64'), index=chunk.index)
+                    whole[~is_whole] = pd.NA
+                    fraction = pd.Series(np.where(is_whole, np.nan, values), index=chunk.index)
+                canonical[f'{i}_whole'] = whole
+                canonical[f'{i}_fraction'] = fraction
+            else:
+                canonical[f'{i}'] = series.astype(object)
+
+        return pd.util.hash_pandas_object(pd.DataFrame(canonical, index=chunk.index), index=False)
 
     def load(self):
         """
@@ -117,10 +251,14 @@ class SimpleETLPipeline:
             # Ensure target directory exists
             Path(self.target_path).parent.mkdir(parents=True, exist_ok=True)
 
-            # Example: Save to CSV
-            self.data.to_csv(self.target_path, index=False)
+            # Example: Save to CSV, appending one chunk at a time
+            record_count = 0
+            for i, chunk in enumerate(self.data):
+                chunk.to_csv(self.target_path, index=False,
+                             mode='w' if i == 0 else 'a', header=i == 0)
+                record_count += len(chunk)
 
-            logger.info(f"Successfully loaded {len(self.data)} records to {self.target_path}")
+            logger.info(f"Successfully loaded {record_count} records to {self.target_path}")
 
             return True
 
@@ -4,12 +4,65 @@ Reusable functions for data validation and quality checks.
 """
 
 import pandas as pd
+import numpy as np
+import math
 import re
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pyarrow is optional; fall back to pandas string methods
+    pa = None
+    pc = None
+
+try:
+    import hyperscan
+except ImportError:  # hyperscan is optional; fall back to the re module
+    hyperscan = None
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; fall back to numpy reductions
+    njit = None
 
 logger = logging.getLogger(__name__)
 
+EMAIL_PATTERN = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+_EMAIL_RE = re.compile(EMAIL_PATTERN)
+
+_email_db = None
+if hyperscan is not None:
+    # Compiled once to a DFA; MULTILINE lets ^/$ anchor on each line of a batch
+    _email_db = hyperscan.Database()
+    _email_db.compile(expressions=[EMAIL_PATTERN.encode()],
+                      flags=[hyperscan.HS_FLAG_MULTILINE])
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _range_counts(values, min_value, max_value):
+        """
+        Count values below min_value and values above max_value in one pass.
+        """
+        below = 0
+        above = 0
+        for i in prange(len(values)):
+            v = values[i]
+            if v < min_value:
+                below += 1
+            if v > max_value:
+                above += 1
+        return below, above
+else:
+    def _range_counts(values, min_value, max_value):
+        """
+        Count values below min_value and values above max_value.
+        """
+        return (np.count_nonzero(values < min_value),
+                np.count_nonzero(values > max_value))
+
 
 class DataQualityChecker:
     """
@@ -26,6 +79,11 @@ class DataQualityChecker:
         self.df = dataframe
         self.issues = []
 
+        # Shared by all checks on this instance instead of being rebuilt per call
+        self._now = pd.Timestamp.now()
+        self._now_utc = pd.Timestamp.now(tz='UTC').tz_localize(None)
+        self._email_re = _EMAIL_RE
+
     def check_completeness(self, required_columns: List[str]) -> Dict[str, Any]:
         """
         Check if required columns have no missing values.
@@ -65,7 +123,9 @@ class DataQualityChecker:
 
         for col in unique_columns:
             if col in self.df.columns:
-                duplicate_count = self.df[col].duplicated().sum()
+                # Size of the hash-based unique set avoids building a boolean mask
+                values = self.df[col].array
+                duplicate_count = len(values) - pd.unique(values).size
                 if duplicate_count > 0:
                     duplicate_data[col] = duplicate_count
                     self.issues.append(f"Column '{col}' has {duplicate_count} duplicate values")
@@ -89,12 +149,17 @@ class DataQualityChecker:
         if email_column not in self.df.columns:
             return {'check': 'email_validity', 'passed': False, 'error': 'Column not found'}
 
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-
         # Check for non-null emails
-        emails = self.df[email_column].dropna()
-        invalid_emails = ~emails.astype(str).str.match(email_pattern)
-        invalid_count = invalid_emails.sum()
+        emails = self.df[email_column].dropna().astype(str)
+
+        if pa is not None:
+            # Arrow's regex kernel runs in C++ over the whole column
+            arr = pa.array(emails, type=pa.string())
+            mask = pc.match_substring_regex(arr, self._email_re.pattern)
+            valid_count = pc.sum(pc.cast(mask, pa.int64())).as_py() or 0
+            invalid_count = len(arr) - valid_count
+        else:
+            invalid_count = int((~emails.str.fullmatch(self._email_re)).sum())
 
         if invalid_count > 0:
             self.issues.append(f"{invalid_count} invalid email addresses found")
@@ -121,19 +186,15 @@ class DataQualityChecker:
         if column not in self.df.columns:
             return {'check': 'numeric_range', 'passed': False, 'error': 'Column not found'}
 
-        issues_found = 0
+        below_min, above_max = self._count_out_of_range(column, min_value, max_value)
 
-        if min_value is not None:
-            below_min = (self.df[column] < min_value).sum()
-            if below_min > 0:
-                issues_found += below_min
-                self.issues.append(f"{below_min} values in '{column}' below minimum {min_value}")
+        issues_found = below_min + above_max
 
-        if max_value is not None:
-            above_max = (self.df[column] > max_value).sum()
-            if above_max > 0:
-                issues_found += above_max
-                self.issues.append(f"{above_max} values in '{column}' above maximum {max_value}")
+        if below_min > 0:
+            self.issues.append(f"{below_min} values in '{column}' below minimum {min_value}")
+
+        if above_max > 0:
+            self.issues.append(f"{above_max} values in '{column}' above maximum {max_value}")
 
         return {
             'check': 'numeric_range',
@@ -141,6 +202,52 @@ class DataQualityChecker:
             'out_of_range_count': issues_found
         }
 
+    def _count_out_of_range(self, column: str, min_value: float = None,
+                            max_value: float = None):
+        """
+        Count values below min_value and above max_value in a numeric column.
+
+        Returns:
+            Tuple of (below_min, above_max) counts
+        """
+        series = self.df[column]
+        if not pd.api.types.is_numeric_dtype(series):
+            raise TypeError(f"Column '{column}' is not numeric (dtype {series.dtype})")
+
+        # Plain (non-nullable) integer columns are compared as int64 so large values
+        # keep full precision; uint64 may not fit and uses the float64 path
+        dtype = series.dtype
+        if isinstance(dtype, np.dtype) and dtype.kind in 'iu' and not (dtype.kind == 'u' and dtype.itemsize == 8):
+            bounds = self._int64_bounds(min_value, max_value)
+            if bounds is not None:
+                values = np.ascontiguousarray(series.to_numpy(dtype=np.int64))
+                return _range_counts(values, *bounds)
+
+        values = np.ascontiguousarray(series.to_numpy(dtype=np.float64, na_value=np.nan))
+        return _range_counts(
+            values,
+            -np.inf if min_value is None else float(min_value),
+            np.inf if max_value is None else float(max_value))
+
+    @staticmethod
+    def _int64_bounds(min_value, max_value):
+        """
+        Integer bounds equivalent to min_value/max_value for int64 data.
+
+        For integers v, v < min_value iff v < ceil(min_value) and
+        v > max_value iff v > floor(max_value). Returns None when a bound
+        cannot be represented as int64, so the caller falls back to float64.
+        """
+        info = np.iinfo(np.int64)
+        try:
+            low = info.min if min_value is None else math.ceil(min_value)
+            high = info.max if max_value is None else math.floor(max_value)
+        except (OverflowError, ValueError, TypeError):
+            return None
+        if not (info.min <= low <= info.max and info.min <= high <= info.max):
+            return None
+        return np.int64(low), np.int64(high)
+
     def check_date_validity(self, date_column: str, future_allowed: bool = False) -> Dict[str, Any]:
         """
         Check if dates are valid and optionally not in the future.
@@ -157,11 +264,21 @@ class DataQualityChecker:
 
         try:
             dates = pd.to_datetime(self.df[date_column], errors='coerce')
-            invalid_dates = dates.isnull().sum()
+            now = self._now
+            if isinstance(dates.dtype, pd.DatetimeTZDtype):
+                # tz-aware values have no int64 view; compare as naive UTC instead
+                dates = dates.dt.tz_convert(None)
+                now = self._now_utc
+            dates = dates.to_numpy()
+
+            # Compare the raw int64 timestamps; NaT is stored as the minimum int64
+            ticks = dates.view('i8')
+            invalid_dates = np.count_nonzero(ticks == np.iinfo(np.int64).min)
 
             future_dates = 0
             if not future_allowed:
-                future_dates = (dates > pd.Timestamp.now()).sum()
+                now = np.datetime64(now).astype(dates.dtype).astype(np.int64)
+                future_dates = np.count_nonzero(ticks > now)
                 if future_dates > 0:
                     self.issues.append(f"{future_dates} dates in future found in '{date_column}'")
 
@@ -178,6 +295,86 @@ class DataQualityChecker:
         except Exception as e:
             return {'check': 'date_validity', 'passed': False, 'error': str(e)}
 
+    def run_checks(self, spec: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run completeness, uniqueness and numeric range checks in one call.
+
+        Null and distinct counts for all columns come from a single
+        DataFrame.agg call and the completeness/uniqueness results are
+        derived from them. Range columns are checked with the same
+        single-pass kernel as check_numeric_range.
+
+        Args:
+            spec: Mapping of column name to rules, e.g.
+                {'id': {'required': True, 'unique': True},
+                 'amount': {'min': 0, 'max': 10000}}
+
+        Returns:
+            List of check results, in the same format as the check_* methods
+        """
+        funcs = {}
+        for col, rules in spec.items():
+            if col not in self.df.columns:
+                continue
+            col_funcs = []
+            if rules.get('required') or rules.get('unique'):
+                col_funcs.append('count')
+            if rules.get('unique'):
+                col_funcs.append('nunique')
+            if col_funcs:
+                funcs[col] = col_funcs
+
+        stats = self.df.agg(funcs) if funcs else pd.DataFrame()
+        total = len(self.df)
+
+        missing_data = {}
+        duplicate_data = {}
+        range_results = []
+
+        for col, rules in spec.items():
+            if col not in self.df.columns:
+                if rules.get('min') is not None or rules.get('max') is not None:
+                    range_results.append({'check': 'numeric_range', 'column': col,
+                                          'passed': False, 'error': 'Column not found'})
+                continue
+
+            null_count = total - int(stats.at['count', col]) if 'count' in funcs.get(col, []) else 0
+
+            if rules.get('required') and null_count > 0:
+                missing_data[col] = null_count
+                self.issues.append(f"Column '{col}' has {null_count} missing values")
+
+            if rules.get('unique'):
+                # duplicated() treats all nulls as equal, so all but one null is a duplicate
+                non_null = total - null_count
+                duplicate_count = non_null - int(stats.at['nunique', col]) + max(null_count - 1, 0)
+                if duplicate_count > 0:
+                    duplicate_data[col] = duplicate_count
+                    self.issues.append(f"Column '{col}' has {duplicate_count} duplicate values")
+
+            min_value, max_value = rules.get('min'), rules.get('max')
+            if min_value is None and max_value is None:
+                continue
+
+            below_min, above_max = self._count_out_of_range(col, min_value, max_value)
+            issues_found = below_min + above_max
+            if below_min > 0:
+                self.issues.append(f"{below_min} values in '{col}' below minimum {min_value}")
+            if above_max > 0:
+                self.issues.append(f"{above_max} values in '{col}' above maximum {max_value}")
+
+            range_results.append({
+                'check': 'numeric_range',
+                'column': col,
+                'passed': issues_found == 0,
+                'out_of_range_count': issues_found
+            })
+
+        return [
+            {'check': 'completeness', 'passed': len(missing_data) == 0, 'missing_data': missing_data},
+            {'check': 'uniqueness', 'passed': len(duplicate_data) == 0, 'duplicates': duplicate_data},
+        ] + range_results
+
     def generate_report(self) -> str:
         """
         Generate a summary report of all quality issues found.
@@ -185,24 +382,28 @@ class DataQualityChecker:
         Returns:
             String containing the quality report
         """
-        report = f"\n{'='*60}\n"
-        report += "DATA QUALITY REPORT\n"
-        report += f"{'='*60}\n"
-        report += f"Total Records: {len(self.df)}\n"
-        report += f"Total Columns: {len(self.df.columns)}\n"
-        report += f"Issues Found: {len(self.issues)}\n"
-        report += f"{'='*60}\n\n"
+        separator = '=' * 60
+        parts = [
+            '',
+            separator,
+            'DATA QUALITY REPORT',
+            separator,
+            f"Total Records: {len(self.df)}",
+            f"Total Columns: {len(self.df.columns)}",
+            f"Issues Found: {len(self.issues)}",
+            separator,
+            '',
+        ]
 
         if self.issues:
-            report += "ISSUES:\n"
-            for i, issue in enumerate(self.issues, 1):
-                report += f"{i}. {issue}\n"
+            parts.append('ISSUES:')
+            parts.extend(f"{i}. {issue}" for i, issue in enumerate(self.issues, 1))
         else:
-            report += "No data quality issues found!\n"
+            parts.append('No data quality issues found!')
 
-        report += f"\n{'='*60}\n"
+        parts.extend(['', separator, ''])
 
-        return report
+        return '\n'.join(parts)
 
 
 def validate_email(email: str) -> bool:
@@ -215,8 +416,47 @@ def validate_email(email: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, str(email)))
+    return bool(_EMAIL_RE.fullmatch(str(email)))
+
+
+def validate_emails_batch(emails: Iterable[Any]) -> np.ndarray:
+    """
+    Validate many email addresses at once.
+
+    Uses a single Hyperscan scan over the newline-joined batch when
+    hyperscan is installed, otherwise validates each email with the
+    compiled regex.
+
+    Args:
+        emails: Iterable of email addresses
+
+    Returns:
+        Boolean numpy array, True where the email is valid
+    """
+    emails = [str(email) for email in emails]
+
+    if _email_db is None:
+        return np.array([bool(_EMAIL_RE.fullmatch(email)) for email in emails], dtype=bool)
+
+    valid = np.zeros(len(emails), dtype=bool)
+    if not emails:
+        return valid
+
+    lines = [email.encode() for email in emails]
+    # Offset at which each email ends in the joined buffer
+    line_ends = np.cumsum([len(line) + 1 for line in lines]) - 1
+
+    def on_match(pattern_id, start, end, flags, context):
+        valid[np.searchsorted(line_ends, end)] = True
+
+    _email_db.scan(b'\n'.join(lines), match_event_handler=on_match)
+
+    # An embedded newline would split one email into two lines
+    for i, email in enumerate(emails):
+        if '\n' in email:
+            valid[i] = False
+
+    return valid
 
 
 def remove_duplicates(df: pd.DataFrame, subset: List[str] = None) -> pd.DataFrame:
@@ -240,6 +480,55 @@ def remove_duplicates(df: pd.DataFrame, subset: List[str] = None) -> pd.DataFram
     return df_clean
 
 
+def optimize_dtypes(df: pd.DataFrame, category_threshold: float = 0.5,
+                    downcast_integers: bool = True) -> pd.DataFrame:
+    """
+    Shrink DataFrame memory by downcasting numbers and categorizing repeated strings.
+
+    Integer downcasting picks the smallest type that fits the current values
+    (e.g. uint8 for [0, 2, 5]). Arithmetic on such columns wraps around
+    silently (uint8 0 - 1 == 255, 5 * 100 == 244), so pass
+    downcast_integers=False if derived columns will be computed from them.
+    Floats are only downcast when no value changes.
+
+    Args:
+        df: Input DataFrame
+        category_threshold: Convert string columns whose unique/total ratio
+            is below this value to 'category'
+        downcast_integers: Whether to downcast integer columns
+
+    Returns:
+        DataFrame with optimized dtypes
+    """
+    memory_before = df.memory_usage(deep=True).sum()
+    optimized = {}
+
+    for col in df.columns:
+        series = df[col]
+
+        if pd.api.types.is_bool_dtype(series):
+            optimized[col] = series
+        elif pd.api.types.is_integer_dtype(series) and downcast_integers:
+            downcast = 'unsigned' if len(series) and series.min() >= 0 else 'integer'
+            optimized[col] = pd.to_numeric(series, downcast=downcast)
+        elif pd.api.types.is_float_dtype(series):
+            # Only keep the smaller float type if no value is rounded by it
+            downcast = pd.to_numeric(series, downcast='float')
+            optimized[col] = downcast if downcast.astype(series.dtype).equals(series) else series
+        elif (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)) \
+                and len(series) and series.nunique() / len(series) < category_threshold:
+            optimized[col] = series.astype('category')
+        else:
+            optimized[col] = series
+
+    df_optimized = pd.DataFrame(optimized, index=df.index)
+
+    memory_after = df_optimized.memory_usage(deep=True).sum()
+    logger.info(f"Optimized dtypes: {memory_before / 1024:.1f} KB -> {memory_after / 1024:.1f} KB")
+
+    return df_optimized
+
+
 def handle_missing_values(df: pd.DataFrame, strategy: str = 'drop',
                          fill_value: Any = None) -> pd.DataFrame:
     """